@@ -0,0 +1,109 @@
+# ---------- Importamos las librerías necesarias ----------
+from datetime import datetime, timedelta
+
+
+# ---------- Definimos el calendario oficial de F1 2025 ----------
+
+# Temporada que analizan todos los scripts
+TEMPORADA = 2025
+
+# Lista completa de carreras con sus nombres en español y fechas
+# (los fines de semana sprint sólo tienen una sesión de libres)
+CALENDARIO_2025 = [
+    {"nombre": "Australia", "fecha": datetime(2025, 3, 16)},
+    {"nombre": "China", "fecha": datetime(2025, 3, 23), "sprint": True},
+    {"nombre": "Japón", "fecha": datetime(2025, 4, 6)},
+    {"nombre": "Bahréin", "fecha": datetime(2025, 4, 13)},
+    {"nombre": "Arabia Saudí", "fecha": datetime(2025, 4, 20)},
+    {"nombre": "Miami", "fecha": datetime(2025, 5, 4), "sprint": True},
+    {"nombre": "Emilia Romaña", "fecha": datetime(2025, 5, 18)},
+    {"nombre": "Mónaco", "fecha": datetime(2025, 5, 25)},
+    {"nombre": "España", "fecha": datetime(2025, 6, 1)},
+    {"nombre": "Canadá", "fecha": datetime(2025, 6, 15)},
+    {"nombre": "Austria", "fecha": datetime(2025, 6, 29)},
+    {"nombre": "Gran Bretaña", "fecha": datetime(2025, 7, 6)},
+    {"nombre": "Bélgica", "fecha": datetime(2025, 7, 27), "sprint": True},
+    {"nombre": "Hungría", "fecha": datetime(2025, 8, 3)},
+    {"nombre": "Países Bajos", "fecha": datetime(2025, 8, 31)},
+    {"nombre": "Italia", "fecha": datetime(2025, 9, 7)},
+    {"nombre": "Azerbaiyán", "fecha": datetime(2025, 9, 21)},
+    {"nombre": "Singapur", "fecha": datetime(2025, 10, 5)},
+    {"nombre": "Estados Unidos", "fecha": datetime(2025, 10, 19), "sprint": True},
+    {"nombre": "México", "fecha": datetime(2025, 10, 26)},
+    {"nombre": "São Paulo", "fecha": datetime(2025, 11, 9), "sprint": True},
+    {"nombre": "Las Vegas", "fecha": datetime(2025, 11, 22)},
+    {"nombre": "Qatar", "fecha": datetime(2025, 11, 30), "sprint": True},
+    {"nombre": "Abu Dabi", "fecha": datetime(2025, 12, 7)}
+]
+
+
+# ---------- Funciones para saber qué sesiones hay que descargar ----------
+
+# Estas funciones no usan fastf1, así que los scripts y el pipeline
+# calculan exactamente las mismas sesiones sin descargar nada
+
+def carreras_disputadas(hoy=None):
+    """Devuelve las carreras ya disputadas como (ronda, nombre).
+
+    Una carrera cuenta como disputada a partir del día siguiente, cuando sus
+    resultados ya están publicados.
+    """
+
+    hoy = hoy or datetime.now()
+    return [(ronda, carrera["nombre"])
+            for ronda, carrera in enumerate(CALENDARIO_2025, start=1)
+            if carrera["fecha"] + timedelta(days=1) <= hoy]
+
+
+def sesion_qualy(hoy=None):
+    """Devuelve (temporada, ronda, 'Q') de la última clasificación disputada.
+
+    La clasificación se corre el sábado, así que el domingo de carrera ya se
+    usa la parrilla de ese mismo fin de semana.
+    """
+
+    hoy = hoy or datetime.now()
+    disputadas = [ronda for ronda, carrera in enumerate(CALENDARIO_2025, start=1)
+                  if carrera["fecha"] - timedelta(days=1) <= hoy]
+    ronda = disputadas[-1] if disputadas else 1
+    return TEMPORADA, ronda, 'Q'
+
+
+def sesiones_disputadas(hoy=None):
+    """Devuelve las sesiones puntuables cuyo día ya ha llegado como (ronda, sesión).
+
+    La sprint ('S') se corre el sábado y la carrera ('R') el domingo. Sus
+    resultados pueden no estar publicados todavía, así que quien las use debe
+    comprobar que se han cargado.
+    """
+
+    hoy = hoy or datetime.now()
+    dias = {'S': timedelta(days=1), 'R': timedelta(0)}
+    return [(ronda, sesion)
+            for ronda, carrera in enumerate(CALENDARIO_2025, start=1)
+            for sesion in sesiones_puntuables(ronda)
+            if carrera["fecha"] - dias[sesion] <= hoy]
+
+
+def rondas_recientes(num_eventos=3, hoy=None):
+    """Devuelve las rondas de los últimos eventos disputados"""
+
+    return [ronda for ronda, _ in carreras_disputadas(hoy)[-num_eventos:]]
+
+
+# ---------- Funciones para saber qué sesiones tiene cada evento ----------
+
+def sesiones_libres(ronda):
+    """Devuelve las sesiones de entrenamientos libres de una ronda"""
+
+    if CALENDARIO_2025[ronda - 1].get("sprint"):
+        return ['FP1']
+    return ['FP1', 'FP2', 'FP3']
+
+
+def sesiones_puntuables(ronda):
+    """Devuelve las sesiones que reparten puntos en una ronda (sprint y carrera)"""
+
+    if CALENDARIO_2025[ronda - 1].get("sprint"):
+        return ['S', 'R']
+    return ['R']
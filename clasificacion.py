@@ -0,0 +1,120 @@
+# ---------- Importamos las librerías necesarias ----------
+import numpy as np
+import pandas as pd
+
+
+# ---------- Sistemas de puntuación ----------
+
+# Puntos por posición (índice 0 = P1). Las posiciones fuera de la lista puntúan 0
+PUNTOS_F1 = [25, 18, 15, 12, 10, 8, 6, 4, 2, 1]
+
+# Puntos de las carreras sprint
+PUNTOS_SPRINT = [8, 7, 6, 5, 4, 3, 2, 1]
+
+# Sistema que sólo cuenta podios (útil para rankings tipo top 3)
+PUNTOS_PODIO = [1, 1, 1]
+
+
+# ---------- Función para codificar nombres como enteros ----------
+
+def codificar(nombres):
+    """Convierte una lista de nombres en códigos enteros y devuelve (códigos, categorías)"""
+
+    codigos, categorias = pd.factorize(pd.Series(nombres, dtype=object))
+    return codigos.astype(np.int64), pd.Index(categorias, name='Nombre')
+
+
+# ---------- Función para construir la matriz posiciones × participantes ----------
+
+def matriz_posiciones(nombres, posiciones, max_posicion=None):
+    """Cuenta cuántas veces acabó cada participante en cada posición.
+
+    Devuelve una matriz de forma (posiciones, participantes) donde la fila p
+    contiene las veces que cada participante terminó en la posición p + 1,
+    junto con el índice de nombres correspondiente a cada columna.
+    """
+
+    posiciones = pd.to_numeric(pd.Series(posiciones), errors='coerce').to_numpy()
+    nombres = pd.Series(nombres, dtype=object).to_numpy()
+
+    # Descartamos resultados sin posición válida (abandonos sin clasificar, DSQ...)
+    validos = ~np.isnan(posiciones) & (posiciones >= 1)
+    codigos, categorias = codificar(nombres[validos])
+    posiciones = posiciones[validos].astype(np.int64)
+
+    if max_posicion is None:
+        max_posicion = int(posiciones.max()) if len(posiciones) else 0
+
+    # Un bincount por posición: cada fila cuenta los participantes en esa posición
+    n = len(categorias)
+    matriz = np.zeros((max_posicion, n), dtype=np.int64)
+    for p in range(max_posicion):
+        matriz[p] = np.bincount(codigos[posiciones == p + 1], minlength=n)
+
+    return matriz, categorias
+
+
+# ---------- Función para calcular puntos a partir de la matriz ----------
+
+def calcular_puntos(matriz, sistema_puntos=PUNTOS_F1):
+    """Aplica un sistema de puntos a la matriz posiciones × participantes"""
+
+    # Ajustamos el vector de puntos al número de posiciones de la matriz
+    puntos = np.zeros(matriz.shape[0], dtype=float)
+    n = min(len(sistema_puntos), matriz.shape[0])
+    puntos[:n] = sistema_puntos[:n]
+
+    return puntos @ matriz
+
+
+# ---------- Función que calcula la clasificación completa ----------
+
+def calcular_clasificacion(nombres, posiciones, sistema_puntos=PUNTOS_F1,
+                           top_n=3, criterio='puntos', prioridad=None):
+    """Calcula la clasificación de pilotos o equipos a partir de sus resultados.
+
+    `criterio` puede ser 'puntos' (desempate por conteo de posiciones, como en
+    el campeonato) o 'top' (ordena por veces en el top N y desempata por
+    conteo dentro de ese top N). `prioridad` es un diccionario opcional
+    nombre -> número usado como último criterio de desempate.
+    """
+
+    matriz, categorias = matriz_posiciones(nombres, posiciones)
+
+    # Aseguramos al menos top_n filas para poder contar podios y top N
+    if matriz.shape[0] < top_n:
+        relleno = np.zeros((top_n - matriz.shape[0], matriz.shape[1]), dtype=np.int64)
+        matriz = np.vstack([matriz, relleno])
+
+    puntos = calcular_puntos(matriz, sistema_puntos)
+    top = matriz[:top_n].sum(axis=0)
+
+    ranking = pd.DataFrame({
+        'Nombre': categorias,
+        'Puntos': puntos,
+        'TotalPodios': matriz[:3].sum(axis=0),
+        'PrimerosLugares': matriz[0],
+        'SegundosLugares': matriz[1] if matriz.shape[0] > 1 else 0,
+        f'Top{top_n}': top,
+    })
+
+    # Mapeamos la prioridad para el desempate absoluto
+    ranking['Prioridad'] = ranking['Nombre'].map(prioridad or {}).fillna(99)
+
+    # Elegimos el criterio principal y cuántas posiciones entran en el desempate
+    if criterio == 'puntos':
+        principal = puntos
+        desempate = matriz
+    elif criterio == 'top':
+        principal = top
+        desempate = matriz[:top_n]
+    else:
+        raise ValueError(f"Criterio desconocido: {criterio}")
+
+    # np.lexsort usa la última clave como principal: criterio, P1, P2, ..., prioridad
+    claves = [ranking['Prioridad'].to_numpy()]
+    claves += [-fila for fila in desempate[::-1]]
+    claves.append(-principal)
+    orden = np.lexsort(claves)
+
+    return ranking.iloc[orden].reset_index(drop=True)
@@ -0,0 +1,55 @@
+# ---------- Importamos las librerías necesarias ----------
+import fastf1
+import fcntl
+import os
+from contextlib import contextmanager
+
+
+# ---------- Configuración de la caché compartida ----------
+
+# Todos los scripts (a mano o desde el pipeline) usan la misma caché de fastf1,
+# así cada sesión se descarga una sola vez
+CACHE_DIR = os.path.expanduser("~/cache_f1")
+
+# Archivo de bloqueo para que los procesos en paralelo no escriban a la vez
+# en la caché (SQLite y archivos pickle)
+BLOQUEO = os.path.join(CACHE_DIR, '.bloqueo')
+
+
+def activar_cache():
+    """Crea la carpeta de la caché y la activa en fastf1"""
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fastf1.Cache.enable_cache(CACHE_DIR)
+
+
+@contextmanager
+def bloqueo_cache():
+    """Reserva la caché en exclusiva mientras dura el bloque"""
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(BLOQUEO, 'w') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+# ---------- Funciones de descarga con la caché bloqueada ----------
+
+def cargar_sesion(año, ronda, sesion, **opciones):
+    """Descarga (o lee de la caché) una sesión y la devuelve cargada"""
+
+    with bloqueo_cache():
+        session = fastf1.get_session(año, ronda, sesion)
+        session.load(**opciones)
+
+    return session
+
+
+def cargar_calendario(año):
+    """Devuelve el calendario oficial de la temporada sin los tests"""
+
+    with bloqueo_cache():
+        return fastf1.get_event_schedule(año, include_testing=False)
@@ -0,0 +1,117 @@
+# ---------- Importamos las librerías necesarias ----------
+import numpy as np
+import pandas as pd
+
+from prediccion import COLUMNAS_PERFIL, PESOS_POR_CIRCUITO, calcular_features
+
+
+# ---------- Columnas de entrada que puede modificar un escenario ----------
+
+COLUMNAS_ESCENARIO = ['Posición', 'media_posicion', 'desviacion_posicion',
+                      'Mejor Tiempo (s)', 'Experiencia', 'Talento',
+                      'Consistencia'] + COLUMNAS_PERFIL
+
+
+# ---------- Función que construye las entradas de todos los escenarios ----------
+
+def construir_entradas(df, escenarios):
+    """Devuelve un diccionario columna -> array (escenarios × pilotos).
+
+    Cada escenario es un diccionario columna -> valores, donde los valores
+    pueden ser un array con un valor por piloto (en el orden de `df`) o un
+    diccionario piloto -> valor que sólo cambia a esos pilotos. Las columnas
+    que un escenario no menciona conservan los valores de `df`.
+    """
+
+    pilotos = pd.Index(df['Piloto'])
+    n_escenarios = len(escenarios)
+
+    # Partimos de los datos actuales repetidos para cada escenario
+    entradas = {
+        col: np.tile(df[col].to_numpy(dtype=float), (n_escenarios, 1))
+        for col in COLUMNAS_ESCENARIO if col in df.columns
+    }
+
+    for i, escenario in enumerate(escenarios):
+        for col, valores in escenario.items():
+            if col not in entradas:
+                raise KeyError(f"Columna no disponible para escenarios: {col}")
+            if isinstance(valores, dict):
+                posiciones = pilotos.get_indexer(list(valores))
+                if (posiciones < 0).any():
+                    raise KeyError(f"Piloto desconocido en el escenario {i}")
+                entradas[col][i, posiciones] = list(valores.values())
+            else:
+                entradas[col][i] = valores
+
+    return entradas
+
+
+# ---------- Función que evalúa todos los escenarios a la vez ----------
+
+def evaluar_escenarios(df, escenarios, circuito="default"):
+    """Calcula la probabilidad de victoria de cada piloto en cada escenario.
+
+    Aplica en una sola pasada vectorizada las mismas cuentas que
+    calcular_scores y generar_resultados. Devuelve un DataFrame con un
+    escenario por fila y un piloto por columna.
+    """
+
+    entradas = construir_entradas(df, escenarios)
+
+    # Scores sin normalizar: array (escenarios × pilotos × features)
+    features = calcular_features(entradas, circuito)
+    scores = np.stack([np.broadcast_to(f, entradas['Posición'].shape)
+                       for f in features.values()], axis=2)
+
+    # RobustScaler seguido de MinMaxScaler equivale a un MinMaxScaler,
+    # así que normalizamos cada feature entre pilotos dentro de cada escenario
+    minimo = scores.min(axis=1, keepdims=True)
+    rango = scores.max(axis=1, keepdims=True) - minimo
+    rango[rango == 0] = 1
+    scores_norm = (scores - minimo) / rango
+
+    # Pesos del circuito y score final
+    pesos = np.array(PESOS_POR_CIRCUITO.get(
+        circuito, PESOS_POR_CIRCUITO["default"]))[:scores.shape[2]]
+    score_final = scores_norm @ pesos
+
+    # Probabilidades de victoria con el mismo suavizado que generar_resultados
+    potencia = np.power(score_final, 1.5)
+    probabilidad = (potencia / potencia.sum(axis=1, keepdims=True) * 100).round(1)
+
+    return pd.DataFrame(probabilidad, columns=pd.Index(df['Piloto'], name='Piloto'),
+                        index=pd.RangeIndex(len(escenarios), name='Escenario'))
+
+
+# ---------- Funciones para generar escenarios habituales ----------
+
+def mover_en_parrilla(df, piloto, posicion):
+    """Escenario en el que `piloto` sale desde `posicion` y el resto se desplaza"""
+
+    orden = df.sort_values('Posición')['Piloto'].tolist()
+    orden.remove(piloto)
+    orden.insert(posicion - 1, piloto)
+
+    return {'Posición': {p: i for i, p in enumerate(orden, 1)}}
+
+
+def invertir_tiempos(df):
+    """Escenario en el que el orden de tiempos de los coches se invierte"""
+
+    tiempos = df['Mejor Tiempo (s)'].to_numpy(dtype=float)
+    orden = np.argsort(tiempos, kind='stable')
+    invertidos = np.empty_like(tiempos)
+    invertidos[orden] = tiempos[orden[::-1]]
+
+    return {'Mejor Tiempo (s)': invertidos}
+
+
+def parrillas_aleatorias(df, n, semilla=None):
+    """Genera n escenarios con permutaciones aleatorias de la parrilla"""
+
+    rng = np.random.default_rng(semilla)
+    posiciones = df['Posición'].to_numpy(dtype=float)
+    permutaciones = rng.permuted(np.tile(posiciones, (n, 1)), axis=1)
+
+    return [{'Posición': fila} for fila in permutaciones]
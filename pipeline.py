@@ -0,0 +1,284 @@
+# ---------- Importamos las librerías necesarias ----------
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from calendario import (TEMPORADA, carreras_disputadas, rondas_recientes,
+                        sesion_qualy, sesiones_disputadas, sesiones_libres)
+
+
+# ---------- Configuración inicial ----------
+
+# Carpeta del proyecto (donde están los scripts)
+base_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Carpeta donde los scripts dejan los CSV y carpeta de Grafana
+output_dir = os.path.expanduser('/home/usuario/CurvaIV/datos/resultados')
+grafana_dir = "/var/lib/grafana/csv"
+
+# Archivo donde guardamos la huella de la última ejecución de cada etapa
+estado_path = os.path.join(output_dir, '.pipeline.json')
+
+
+# ---------- Identificadores de las sesiones que usa cada etapa ----------
+
+# Salen de las mismas funciones de calendario.py que usan los scripts
+
+def sesiones_coches():
+    return [(TEMPORADA, 1, 'FP1')]
+
+
+def sesiones_qualy():
+    return [sesion_qualy()]
+
+
+def sesiones_carreras():
+    return [(TEMPORADA, nombre, 'R') for _, nombre in carreras_disputadas()[-3:]]
+
+
+def sesiones_perfil():
+    return [(TEMPORADA, ronda, sesion) for ronda in rondas_recientes()
+            for sesion in sesiones_libres(ronda)]
+
+
+def sesiones_temporada():
+    return [(TEMPORADA, ronda, 'R') for ronda, _ in carreras_disputadas()]
+
+
+def sesiones_proyeccion():
+    return [(TEMPORADA, ronda, sesion) for ronda, sesion in sesiones_disputadas()]
+
+
+# ---------- Definimos las etapas del pipeline ----------
+
+# Cada etapa indica el script que ejecuta, el código del que depende, las
+# etapas previas, los archivos que lee y escribe y las sesiones que descarga.
+# Si una etapa opcional falla, las que dependen de ella se ejecutan igualmente.
+# Los pesos por circuito viven en prediccion.py, así que su hash los cubre.
+ETAPAS = {
+    'coches': {
+        'script': 'script_coches.py',
+        'codigo': ['script_coches.py', 'calendario.py', 'datos_f1.py'],
+        'depende': [],
+        'entradas': [],
+        'salidas': [os.path.join(output_dir, 'coches.csv')],
+        'sesiones': sesiones_coches,
+    },
+    'qualy': {
+        'script': 'script_qualy.py',
+        'codigo': ['script_qualy.py', 'calendario.py', 'datos_f1.py'],
+        'depende': [],
+        'entradas': [],
+        'salidas': [os.path.join(output_dir, 'qualy.csv')],
+        'sesiones': sesiones_qualy,
+    },
+    'carreras': {
+        'script': 'script_carreras.py',
+        'codigo': ['script_carreras.py', 'calendario.py', 'datos_f1.py'],
+        'depende': [],
+        'entradas': [],
+        'salidas': [os.path.join(output_dir, 'ultimas_carreras.csv')],
+        'sesiones': sesiones_carreras,
+    },
+    'perfil': {
+        'script': 'script_perfil_coches.py',
+        'codigo': ['script_perfil_coches.py', 'prediccion.py', 'calendario.py',
+                   'datos_f1.py'],
+        'depende': [],
+        'entradas': [],
+        'salidas': [os.path.join(output_dir, 'perfil_coches.csv')],
+        'sesiones': sesiones_perfil,
+        'opcional': True,
+    },
+    'top3': {
+        'script': 'top3.py',
+        'codigo': ['top3.py', 'clasificacion.py', 'calendario.py', 'datos_f1.py'],
+        'depende': [],
+        'entradas': [],
+        'salidas': [os.path.join(grafana_dir, 'top3_pilotos.csv'),
+                    os.path.join(grafana_dir, 'top3_escuderias.csv')],
+        'sesiones': sesiones_temporada,
+    },
+    'prediccion': {
+        'script': 'prediccion.py',
+        'codigo': ['prediccion.py'],
+        'depende': ['coches', 'qualy', 'carreras', 'perfil'],
+        'entradas': [os.path.join(output_dir, f) for f in
+                     ('coches.csv', 'qualy.csv', 'ultimas_carreras.csv', 'perfil_coches.csv')],
+        'salidas': [os.path.join(grafana_dir, 'curva4.csv'),
+                    os.path.join(grafana_dir, 'queso_curva4.csv')],
+        'sesiones': lambda: [],
+        'argumentos': True,
+    },
+    'proyeccion': {
+        'script': 'proyeccion.py',
+        'codigo': ['proyeccion.py', 'prediccion.py', 'clasificacion.py', 'calendario.py',
+                   'datos_f1.py'],
+        'depende': ['coches', 'qualy', 'carreras', 'perfil'],
+        'entradas': [os.path.join(output_dir, f) for f in
+                     ('coches.csv', 'qualy.csv', 'ultimas_carreras.csv', 'perfil_coches.csv')],
+        'salidas': [os.path.join(grafana_dir, 'proyeccion_pilotos.csv'),
+                    os.path.join(grafana_dir, 'proyeccion_escuderias.csv')],
+        'sesiones': sesiones_proyeccion,
+    },
+}
+
+
+# ---------- Funciones para calcular la huella de cada etapa ----------
+
+def hash_archivo(path):
+    """Devuelve el SHA-256 de un archivo, o None si no existe"""
+
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def calcular_huella(etapa, circuito):
+    """Resume en un hash todo lo que determina la salida de una etapa"""
+
+    partes = {
+        'codigo': [hash_archivo(os.path.join(base_dir, f)) for f in etapa['codigo']],
+        'entradas': [hash_archivo(f) for f in etapa['entradas']],
+        'sesiones': [list(map(str, s)) for s in etapa['sesiones']()],
+        'circuito': circuito if etapa.get('argumentos') else None,
+    }
+    texto = json.dumps(partes, sort_keys=True, ensure_ascii=False)
+
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+def cargar_estado():
+    if not os.path.exists(estado_path):
+        return {}
+    with open(estado_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def guardar_estado(estado):
+    os.makedirs(output_dir, exist_ok=True)
+    with open(estado_path, 'w', encoding='utf-8') as f:
+        json.dump(estado, f, indent=2, sort_keys=True)
+
+
+# ---------- Función que ejecuta una etapa ----------
+
+def ejecutar_etapa(etapa, circuito):
+    """Ejecuta el script de una etapa y devuelve True si ha regenerado sus salidas"""
+
+    comando = [sys.executable, os.path.join(base_dir, etapa['script'])]
+    if etapa.get('argumentos'):
+        comando.append(circuito)
+
+    # Los scripts de análisis leen los CSV desde la carpeta de resultados
+    cwd = output_dir if etapa['entradas'] else base_dir
+
+    inicio = time.time()
+    proceso = subprocess.run(comando, cwd=cwd, stdin=subprocess.DEVNULL)
+
+    # Los scripts salen con error si los datos están incompletos; además
+    # comprobamos que las salidas se han regenerado
+    return proceso.returncode == 0 and all(
+        os.path.exists(s) and os.path.getmtime(s) >= inicio
+        for s in etapa['salidas'])
+
+
+# ---------- Función principal del pipeline ----------
+
+def ejecutar_pipeline(circuito="default", forzar=False, max_workers=4):
+    """Ejecuta las etapas en orden de dependencias, en paralelo cuando es posible,
+    saltando las que ya están al día. Cada etapa se lanza en cuanto terminan
+    sus propias dependencias."""
+
+    estado = cargar_estado()
+    pendientes = dict(ETAPAS)
+    completadas = set()
+    fallidas = set()
+    en_curso = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pendientes or en_curso:
+
+            # Lanzamos (o saltamos) todas las etapas cuyas dependencias ya han
+            # terminado; repetimos porque saltar una puede desbloquear otras
+            lanzada = True
+            while lanzada:
+                lanzada = False
+                listas = [n for n, e in pendientes.items()
+                          if all(d in completadas or d in fallidas for d in e['depende'])]
+
+                for nombre in listas:
+                    etapa = pendientes.pop(nombre)
+                    lanzada = True
+
+                    if any(d in fallidas for d in etapa['depende']):
+                        print(f" {nombre}: omitida (falló una dependencia)")
+                        fallidas.add(nombre)
+                        continue
+
+                    # Saltamos la etapa si su huella coincide y sus salidas existen
+                    huella = calcular_huella(etapa, circuito)
+                    if (not forzar and estado.get(nombre) == huella
+                            and all(os.path.exists(s) for s in etapa['salidas'])):
+                        print(f" {nombre}: al día")
+                        completadas.add(nombre)
+                        continue
+
+                    print(f" {nombre}: ejecutando...")
+                    futuro = pool.submit(ejecutar_etapa, etapa, circuito)
+                    en_curso[futuro] = (nombre, huella)
+
+            if not en_curso:
+                if pendientes:
+                    raise RuntimeError(f"Dependencias circulares en: {list(pendientes)}")
+                break
+
+            # Esperamos a que termine cualquier etapa en ejecución
+            terminados, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+            for futuro in terminados:
+                nombre, huella = en_curso.pop(futuro)
+                if futuro.result():
+                    estado[nombre] = huella
+                    completadas.add(nombre)
+                    print(f" {nombre}: completada")
+                else:
+                    # Sin huella guardada, la etapa se reintenta en la próxima ejecución
+                    estado.pop(nombre, None)
+                    if ETAPAS[nombre].get('opcional'):
+                        completadas.add(nombre)
+                        print(f" {nombre}: error (etapa opcional, se continúa)")
+                    else:
+                        fallidas.add(nombre)
+                        print(f" {nombre}: error, datos incompletos o sin salidas")
+
+            guardar_estado(estado)
+
+    return completadas, fallidas
+
+
+# ---------- Punto de entrada principal del programa ----------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Actualiza los datos y predicciones de CurvaIV")
+    parser.add_argument('--circuito', default="default",
+                        help="Circuito usado por prediccion.py")
+    parser.add_argument('--forzar', action='store_true',
+                        help="Ejecuta todas las etapas aunque estén al día")
+    parser.add_argument('--procesos', type=int, default=4,
+                        help="Número máximo de etapas en paralelo")
+    args = parser.parse_args()
+
+    print("\n🔍 Actualizando pipeline de CurvaIV...")
+    inicio = time.time()
+
+    _, fallidas = ejecutar_pipeline(args.circuito, args.forzar, args.procesos)
+
+    print(f"\nPipeline terminado en {time.time() - inicio:.2f} s")
+    if fallidas:
+        sys.exit(1)
@@ -1,4 +1,6 @@
 # ---------- Importamos las librerías necesarias para el análisis de datos ----------
+import os
+import sys
 import pandas as pd
 import numpy as np
 from sklearn.preprocessing import RobustScaler, MinMaxScaler
@@ -45,6 +47,89 @@ PESOS_POR_CIRCUITO = {
 }
 
 
+# ---------- Definimos las características de cada circuito ----------
+
+# Proporción de la vuelta en curvas lentas, medias y rápidas/rectas
+#               [baja, media, alta]
+CARACTERISTICAS_CIRCUITO = {
+
+    # Circuitos lentos y ratoneros
+    "Montecarlo":                 [0.75, 0.20, 0.05],
+    "Marina Bay":                 [0.60, 0.30, 0.10],
+    "Hungaroring":                [0.45, 0.40, 0.15],
+    "Montreal":                   [0.45, 0.15, 0.40],
+    "Miami":                      [0.40, 0.30, 0.30],
+    "Hermanos Rodríguez":         [0.40, 0.30, 0.30],
+    "Yas Marina":                 [0.40, 0.35, 0.25],
+
+    # Circuitos de baja carga aerodinámica
+    "Monza":                      [0.15, 0.15, 0.70],
+    "Las Vegas Street Circuit":   [0.30, 0.15, 0.55],
+    "Bakú":                       [0.35, 0.15, 0.50],
+    "Jeddah":                     [0.15, 0.35, 0.50],
+    "Spa-Francorchamps":          [0.20, 0.30, 0.50],
+    "Silverstone":                [0.15, 0.35, 0.50],
+    "Red Bull Ring":              [0.35, 0.25, 0.40],
+
+    # Circuitos equilibrados o de curvas medias
+    "Suzuka":                     [0.15, 0.45, 0.40],
+    "Lusail":                     [0.15, 0.50, 0.35],
+    "Zandvoort":                  [0.25, 0.50, 0.25],
+    "Melbourne":                  [0.30, 0.35, 0.35],
+    "Shanghái":                   [0.35, 0.35, 0.30],
+    "Barcelona-Catalunya":        [0.30, 0.40, 0.30],
+    "Circuit of the Americas (COTA)": [0.30, 0.40, 0.30],
+    "Imola":                      [0.30, 0.40, 0.30],
+    "Interlagos":                 [0.30, 0.40, 0.30],
+
+    # Por defecto
+    "default":                    [0.33, 0.34, 0.33]
+}
+
+# Columnas del perfil de coche generado por script_perfil_coches.py
+COLUMNAS_PERFIL = ['indice_baja', 'indice_media', 'indice_alta']
+
+
+# ---------- Relacionamos la localización de fastf1 con cada circuito ----------
+
+# Claves: columna 'Location' del calendario de fastf1
+CIRCUITO_POR_LOCALIZACION = {
+    "Melbourne": "Melbourne",
+    "Shanghai": "Shanghái",
+    "Suzuka": "Suzuka",
+    "Jeddah": "Jeddah",
+    "Miami": "Miami",
+    "Imola": "Imola",
+    "Monaco": "Montecarlo",
+    "Monte Carlo": "Montecarlo",
+    "Barcelona": "Barcelona-Catalunya",
+    "Montréal": "Montreal",
+    "Montreal": "Montreal",
+    "Spielberg": "Red Bull Ring",
+    "Silverstone": "Silverstone",
+    "Spa-Francorchamps": "Spa-Francorchamps",
+    "Budapest": "Hungaroring",
+    "Zandvoort": "Zandvoort",
+    "Monza": "Monza",
+    "Baku": "Bakú",
+    "Marina Bay": "Marina Bay",
+    "Singapore": "Marina Bay",
+    "Austin": "Circuit of the Americas (COTA)",
+    "Mexico City": "Hermanos Rodríguez",
+    "São Paulo": "Interlagos",
+    "Sao Paulo": "Interlagos",
+    "Las Vegas": "Las Vegas Street Circuit",
+    "Lusail": "Lusail",
+    "Yas Island": "Yas Marina",
+    "Yas Marina": "Yas Marina",
+}
+
+
+def circuito_de_evento(localizacion):
+    """Devuelve la clave de PESOS_POR_CIRCUITO para una localización de fastf1"""
+    return CIRCUITO_POR_LOCALIZACION.get(localizacion, "default")
+
+
 # ---------- Función para cargar los datos desde los archivos CSV ----------
 
 def cargar_datos():
@@ -54,6 +139,12 @@ def cargar_datos():
     df_coches = pd.read_csv("coches.csv")
     df_qualy = pd.read_csv("qualy.csv")
 
+    # El perfil del coche por tipo de curva es opcional
+    if os.path.exists("perfil_coches.csv"):
+        df_perfil = pd.read_csv("perfil_coches.csv")
+    else:
+        df_perfil = pd.DataFrame(columns=['Equipo'] + COLUMNAS_PERFIL)
+
     # Asignamos un valor a la experiencia, talento y cosistencia a cada piloto
     pilotos = ['M. Verstappen', 'L. Norris', 'O. Piastri', 'C. Leclerc', 'G. Russell',
                'K. Antonelli', 'L. Hamilton', 'I. Hadjar', 'A. Albon', 'O. Bearman',
@@ -94,6 +185,11 @@ def cargar_datos():
         on='Piloto', how='left'
     )
 
+    # Añadimos el perfil del coche sólo si existe
+    if not df_perfil.empty:
+        df = df.merge(df_perfil[['Equipo'] + COLUMNAS_PERFIL],
+                      on='Equipo', how='left')
+
     return df
 
 
@@ -123,28 +219,56 @@ def preprocesar(df):
     df['Mejor Tiempo (s)'] = df['Mejor Tiempo (s)'].fillna(
         df['Mejor Tiempo (s)'].median())
 
+    # Rellenamos el perfil del coche con la mediana si falta algún equipo
+    for col in COLUMNAS_PERFIL:
+        if col in df.columns:
+            df[col] = df[col].fillna(df[col].median())
+
     return df
 
 
 # ---------- Función para calcular los scores de cada piloto ----------
 
-def calcular_scores(df, circuito="default"):
+def calcular_features(datos, circuito="default"):
+    """Calcula los scores sin normalizar de cada piloto.
+
+    `datos` puede ser un DataFrame o un diccionario de arrays de NumPy de
+    cualquier forma (por ejemplo escenarios × pilotos), ya que todas las
+    operaciones son elemento a elemento.
+    """
+
+    features = {}
 
     # Calculamos el score de qualy
-    df['score_qualy'] = 1 / df['Posición']
+    features['score_qualy'] = 1 / datos['Posición']
 
     # Calculamos el score de carrera considerando posición media y consistencia
-    df['score_carrera'] = (1 / df['media_posicion']) * \
-        (1 / (1 + df.get('desviacion_posicion', 0)))
-
-    # Calculamos el score del coche basado en el mejor tiempo
-    df['score_coche'] = 1 / (df['Mejor Tiempo (s)'] ** 0.9)
+    features['score_carrera'] = (1 / datos['media_posicion']) * \
+        (1 / (1 + datos.get('desviacion_posicion', 0)))
+
+    # Calculamos el score del coche basado en el mejor tiempo; con perfil, lo
+    # ajustamos además según el tipo de curvas del circuito
+    features['score_coche'] = 1 / (datos['Mejor Tiempo (s)'] ** 0.9)
+    if all(col in datos for col in COLUMNAS_PERFIL):
+        caracteristicas = CARACTERISTICAS_CIRCUITO.get(
+            circuito, CARACTERISTICAS_CIRCUITO["default"])
+        features['score_coche'] = features['score_coche'] * sum(
+            datos[col] * peso for col, peso in zip(COLUMNAS_PERFIL, caracteristicas))
 
     # Calculamos el score de experiencia
-    df['score_experiencia'] = np.sqrt(df['Experiencia'] + 1)
+    features['score_experiencia'] = np.sqrt(datos['Experiencia'] + 1)
 
     # Calculamos el score de habilidad combinando talento y consistencia
-    df['score_habilidad'] = (df['Talento'] * 0.8 + df['Consistencia'] * 0.2)
+    features['score_habilidad'] = (datos['Talento'] * 0.8 + datos['Consistencia'] * 0.2)
+
+    return features
+
+
+def calcular_scores(df, circuito="default"):
+
+    # Calculamos los scores de qualy, carrera, coche, experiencia y habilidad
+    for nombre, valores in calcular_features(df, circuito).items():
+        df[nombre] = valores
 
     # Normalizamos los scores para que sean comparables
     features = ['score_qualy', 'score_carrera',
@@ -219,8 +343,11 @@ if __name__ == "__main__":
 
     try:
 
-        # Seleccionamos el circuito
-        circuito = seleccionar_circuito()
+        # Seleccionamos el circuito (o lo recibimos como argumento)
+        if len(sys.argv) > 1 and sys.argv[1] in PESOS_POR_CIRCUITO:
+            circuito = sys.argv[1]
+        else:
+            circuito = seleccionar_circuito()
         print(f"\nUsando pesos para el circuito: {circuito}\n")
 
         # Cargamos, procesamos y calculamos los datos
@@ -243,3 +370,4 @@ if __name__ == "__main__":
 
     except Exception as e:
         print(f"\nError: {str(e)}")
+        sys.exit(1)
@@ -0,0 +1,317 @@
+# ---------- Importamos las librerías necesarias ----------
+import os
+import sys
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+from calendario import TEMPORADA, sesiones_disputadas, sesiones_puntuables
+from datos_f1 import activar_cache, cargar_calendario, cargar_sesion
+from clasificacion import PUNTOS_F1, PUNTOS_SPRINT, calcular_clasificacion
+from prediccion import (cargar_datos, preprocesar, calcular_scores,
+                        circuito_de_evento)
+
+
+# ---------- Configuración inicial ----------
+
+year = TEMPORADA
+
+# Caché compartida de fastf1 para los datos descargados
+activar_cache()
+
+# Carpeta donde se guardarán los CSV para Grafana
+grafana_dir = "/var/lib/grafana/csv"
+
+# Número de temporadas simuladas y tamaño de cada lote de simulaciones
+NUM_SIMULACIONES = 100_000
+TAMANO_LOTE = 10_000
+
+# Peso mínimo para que ningún piloto tenga probabilidad nula de puntuar
+PESO_MINIMO = 1e-3
+
+# Sistema de puntos de cada sesión puntuable: carrera y sprint
+PUNTOS_POR_SESION = {'R': PUNTOS_F1, 'S': PUNTOS_SPRINT}
+
+
+# ---------- Función para obtener los resultados y las rondas restantes ----------
+
+def obtener_temporada():
+    """Devuelve (resultados ya disputados, sesiones puntuables que quedan por correr,
+    completo).
+
+    Las sesiones que se intentan cargar salen de calendario.py, igual que la
+    huella del pipeline. Una sesión cuenta como disputada sólo si sus
+    resultados se han podido cargar; si no (por ejemplo, una carrera que se
+    corre hoy) vuelve a las sesiones restantes y `completo` es False.
+    Los fines de semana sprint aportan dos sesiones puntuables: la sprint
+    ('S') y la carrera ('R').
+    """
+
+    calendario = cargar_calendario(year)
+    disputadas = set(sesiones_disputadas())
+
+    resultados = []
+    restantes = []
+    completo = True
+    for _, evento in calendario.iterrows():
+        ronda = evento['RoundNumber']
+
+        for sesion in sesiones_puntuables(ronda):
+            cargada = None
+
+            if (ronda, sesion) in disputadas:
+                try:
+                    session = cargar_sesion(year, ronda, sesion,
+                                            telemetry=False, weather=False)
+                    if session.results['Position'].notna().any():
+                        cargada = (session.results[['FullName', 'TeamName', 'Position']]
+                                   .assign(Sesion=sesion))
+                except Exception as e:
+                    print(f"Sin resultados de {sesion} en la ronda {ronda}: {e}")
+
+            if cargada is None:
+                completo = completo and (ronda, sesion) not in disputadas
+                restantes.append({'RoundNumber': ronda,
+                                  'Location': evento['Location'],
+                                  'Sesion': sesion})
+            else:
+                resultados.append(cargada)
+
+    if resultados:
+        resultados = pd.concat(resultados, ignore_index=True)
+    else:
+        resultados = pd.DataFrame(columns=['FullName', 'TeamName', 'Position', 'Sesion'])
+
+    restantes = pd.DataFrame(restantes, columns=['RoundNumber', 'Location', 'Sesion'])
+
+    return resultados, restantes, completo
+
+
+# ---------- Función que calcula la clasificación actual ----------
+
+def clasificacion_actual(resultados, columna):
+    """Devuelve los puntos actuales (carreras y sprints) ordenados de líder a último.
+
+    Los empates se resuelven con el conteo de posiciones de las carreras.
+    """
+
+    puntos = []
+    for sesion, sistema in PUNTOS_POR_SESION.items():
+        parte = resultados[resultados['Sesion'] == sesion]
+        clasificacion = calcular_clasificacion(
+            parte[columna], parte['Position'], sistema_puntos=sistema)
+        puntos.append(clasificacion.set_index('Nombre')['Puntos'])
+        if sesion == 'R':
+            desempate = pd.Series(range(len(clasificacion)),
+                                  index=clasificacion['Nombre'])
+
+    actual = pd.DataFrame({'Puntos': pd.concat(puntos, axis=1).sum(axis=1)})
+    actual['Desempate'] = desempate.reindex(actual.index).fillna(len(desempate))
+
+    return actual.sort_values(['Puntos', 'Desempate'],
+                              ascending=[False, True])['Puntos']
+
+
+# ---------- Función que calcula los pesos de cada piloto en cada ronda ----------
+
+def calcular_pesos(df, circuitos):
+    """Devuelve una matriz (rondas × pilotos) con la fuerza relativa de cada piloto.
+
+    Usa el mismo score que prediccion.py (score_final ** 1.5) con los pesos
+    de PESOS_POR_CIRCUITO de cada circuito.
+    """
+
+    # Calculamos una sola vez cada circuito distinto
+    por_circuito = {}
+    for circuito in set(circuitos):
+        scores = calcular_scores(df.copy(), circuito=circuito)['score_final']
+        por_circuito[circuito] = np.power(scores.to_numpy(), 1.5)
+
+    pesos = np.array([por_circuito[c] for c in circuitos]).reshape(
+        len(circuitos), len(df))
+    pesos = np.maximum(pesos, PESO_MINIMO)
+
+    return pesos / pesos.sum(axis=1, keepdims=True)
+
+
+# ---------- Función que simula un lote de temporadas ----------
+
+def simular_lote(log_pesos, puntos_posicion, agregacion, iniciales_pilotos,
+                 iniciales_equipos, n_sim, semilla):
+    """Simula n_sim temporadas y devuelve títulos y suma de puntos de pilotos y equipos.
+
+    Cada carrera se genera con el modelo de Plackett-Luce mediante el truco de
+    Gumbel: ordenar log(peso) + ruido Gumbel equivale a sacar pilotos sin
+    reemplazo en proporción a su peso. El tensor de trabajo tiene forma
+    (simulaciones × rondas × pilotos).
+    """
+
+    rng = np.random.default_rng(semilla)
+    n_rondas, n_pilotos = log_pesos.shape
+
+    # Orden de llegada de cada carrera simulada
+    ruido = rng.gumbel(size=(n_sim, n_rondas, n_pilotos)).astype(np.float32)
+    orden = np.argsort(-(log_pesos + ruido), axis=2)
+
+    # Repartimos los puntos según la posición de llegada
+    puntos = np.zeros((n_sim, n_rondas, n_pilotos), dtype=np.float32)
+    np.put_along_axis(puntos, orden,
+                      np.broadcast_to(puntos_posicion, orden.shape), axis=2)
+    puntos = puntos.sum(axis=1)
+
+    # Puntos finales de pilotos y equipos (matriz pilotos × equipos)
+    finales_pilotos = iniciales_pilotos + puntos
+    finales_equipos = iniciales_equipos + puntos @ agregacion
+
+    return (contar_titulos(finales_pilotos), finales_pilotos.sum(axis=0, dtype=float),
+            contar_titulos(finales_equipos), finales_equipos.sum(axis=0, dtype=float))
+
+
+def contar_titulos(finales):
+    """Cuenta los títulos de cada columna (empates a favor del líder actual)"""
+
+    n = finales.shape[1]
+    campeones = np.argmax(finales - np.arange(n) * 1e-3, axis=1)
+    return np.bincount(campeones, minlength=n)
+
+
+# ---------- Función principal de la proyección ----------
+
+def proyectar_campeonato(resultados, df, circuitos, sesiones=None,
+                         n_sim=NUM_SIMULACIONES, procesos=None, semilla=None):
+    """Proyecta el campeonato de pilotos y equipos hasta final de temporada.
+
+    `resultados` son los resultados de las sesiones ya disputadas (columnas
+    FullName, TeamName, Position y Sesion, 'R' o 'S'), `df` la parrilla
+    preprocesada de prediccion.py, `circuitos` el circuito de cada sesión
+    que queda por correr y `sesiones` su tipo ('R' por defecto).
+    Con `procesos` > 1 los lotes se reparten en un pool de procesos.
+    Devuelve (proyección de pilotos, proyección de equipos).
+    """
+
+    if 'Sesion' not in resultados.columns:
+        resultados = resultados.assign(Sesion='R')
+    if sesiones is None:
+        sesiones = ['R'] * len(circuitos)
+
+    # Clasificación actual a partir de los resultados de la temporada
+    puntos_actuales = clasificacion_actual(resultados, 'FullName')
+
+    # Participantes: quien ya tenga puntos este año más la parrilla actual
+    pilotos = puntos_actuales.index.tolist()
+    pilotos += [p for p in df['Piloto'] if p not in set(pilotos)]
+    ultimo_equipo = (resultados.drop_duplicates('FullName', keep='last')
+                     .set_index('FullName')['TeamName'])
+    equipo_piloto = (df.set_index('Piloto')['Equipo']
+                     .combine_first(ultimo_equipo).reindex(pilotos))
+    iniciales_pilotos = puntos_actuales.reindex(pilotos).fillna(0)
+
+    # Clasificación de equipos con los puntos sumados para cada escudería en su
+    # momento (un piloto que cambia de equipo no se lleva sus puntos)
+    actual_equipos = clasificacion_actual(resultados, 'TeamName')
+    equipos = actual_equipos.index.tolist()
+    equipos = pd.Index(equipos + [e for e in pd.unique(equipo_piloto.dropna())
+                                  if e not in set(equipos)])
+    iniciales_equipos = actual_equipos.reindex(equipos).fillna(0)
+
+    # Sólo los puntos futuros de cada piloto van a su equipo actual
+    agregacion = np.zeros((len(pilotos), len(equipos)), dtype=np.float32)
+    agregacion[np.arange(len(pilotos)), equipos.get_indexer(equipo_piloto)] = 1
+
+    # Pesos de cada ronda expandidos a todos los participantes (0 si no corren)
+    columnas = pd.Index(pilotos).get_indexer(df['Piloto'])
+    pesos = np.zeros((len(circuitos), len(pilotos)))
+    if circuitos:
+        pesos[:, columnas] = calcular_pesos(df, circuitos)
+    with np.errstate(divide='ignore'):
+        log_pesos = np.log(pesos).astype(np.float32)
+
+    # Puntos por posición de cada sesión restante (sesiones × posiciones)
+    puntos_posicion = np.zeros((len(circuitos), len(pilotos)), dtype=np.float32)
+    for i, sesion in enumerate(sesiones):
+        sistema = PUNTOS_POR_SESION[sesion]
+        n = min(len(sistema), len(pilotos))
+        puntos_posicion[i, :n] = sistema[:n]
+
+    # Repartimos las simulaciones en lotes con semillas independientes
+    lotes = [min(TAMANO_LOTE, n_sim - i) for i in range(0, n_sim, TAMANO_LOTE)]
+    semillas = np.random.SeedSequence(semilla).spawn(len(lotes))
+    argumentos = [(log_pesos, puntos_posicion, agregacion,
+                   iniciales_pilotos.to_numpy(np.float32),
+                   iniciales_equipos.to_numpy(np.float32), n, s)
+                  for n, s in zip(lotes, semillas)]
+
+    if procesos and procesos > 1:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            parciales = list(pool.map(simular_lote, *zip(*argumentos)))
+    else:
+        parciales = [simular_lote(*a) for a in argumentos]
+
+    titulos_pilotos, puntos_pilotos, titulos_equipos, puntos_equipos = (
+        sum(p[i] for p in parciales) for i in range(4))
+
+    proyeccion_pilotos = pd.DataFrame({
+        'Piloto': pilotos,
+        'Equipo': equipo_piloto.to_numpy(),
+        'PuntosActuales': iniciales_pilotos.to_numpy(),
+        'PuntosEsperados': (puntos_pilotos / n_sim).round(1),
+        'ProbabilidadTitulo': (titulos_pilotos / n_sim * 100).round(2),
+    })
+    proyeccion_equipos = pd.DataFrame({
+        'Equipo': equipos,
+        'PuntosActuales': iniciales_equipos.to_numpy(),
+        'PuntosEsperados': (puntos_equipos / n_sim).round(1),
+        'ProbabilidadTitulo': (titulos_equipos / n_sim * 100).round(2),
+    })
+
+    # Ordenamos por probabilidad de título y empezamos el ranking desde 1
+    resultado = []
+    for proyeccion in (proyeccion_pilotos, proyeccion_equipos):
+        proyeccion = proyeccion.sort_values(
+            ['ProbabilidadTitulo', 'PuntosEsperados'],
+            ascending=False).reset_index(drop=True)
+        proyeccion.index += 1
+        resultado.append(proyeccion)
+
+    return tuple(resultado)
+
+
+# ---------- Punto de entrada principal del programa ----------
+
+if __name__ == "__main__":
+    print(f"Proyectando el campeonato {year}...\n")
+
+    try:
+        # Parrilla y scores de pilotos (desde los CSV de datos/resultados)
+        df = preprocesar(cargar_datos())
+
+        # Resultados disputados y sesiones que quedan por correr
+        resultados, restantes, completo = obtener_temporada()
+        circuitos = [circuito_de_evento(l) for l in restantes['Location']]
+        print(f"Sesiones puntuables restantes: {len(circuitos)}")
+
+        pilotos, equipos = proyectar_campeonato(
+            resultados, df, circuitos, restantes['Sesion'].tolist(),
+            procesos=os.cpu_count())
+
+        print("\nPROBABILIDAD DE TÍTULO - PILOTOS\n")
+        print(pilotos.head(10).to_string())
+        print("\nPROBABILIDAD DE TÍTULO - ESCUDERÍAS\n")
+        print(equipos.to_string())
+
+        # Guardamos los resultados en archivos CSV para Grafana
+        pilotos.to_csv(os.path.join(grafana_dir, 'proyeccion_pilotos.csv'),
+                       index_label='Ranking')
+        equipos.to_csv(os.path.join(grafana_dir, 'proyeccion_escuderias.csv'),
+                       index_label='Ranking')
+
+        print(f"\nResultados guardados en {grafana_dir}")
+
+    except Exception as e:
+        print(f"\nError: {str(e)}")
+        sys.exit(1)
+
+    # Avisamos con un código de error si falta alguna sesión ya disputada
+    if not completo:
+        print("Aviso: faltan resultados de sesiones ya disputadas")
+        sys.exit(1)
@@ -1,14 +1,16 @@
 # ---------- Importamos las librerías necesarias ----------
-import fastf1
 import csv
 import os
-from datetime import datetime
+import sys
+
+from calendario import TEMPORADA
+from datos_f1 import activar_cache, cargar_sesion
 
 
 # ---------- Configuración inicial ----------
 
-# Activamos la caché de la API para usar sus datos
-fastf1.Cache.enable_cache('cache_f1')
+# Activamos la caché compartida de la API para usar sus datos
+activar_cache()
 
 
 # ---------- Preparamos la ruta de salida ----------
@@ -24,13 +26,12 @@ if os.path.exists(filename):
 # ---------- Obtenemos los datos del evento de tests ----------
 
 # Establecemos el año y la ronda de test
-año = 2025
+año = TEMPORADA
 ronda = 1
 
 try:
     # Cargamos la sesión de entrenamientos libres 1
-    session = fastf1.get_session(año, ronda, 'FP1')
-    session.load()  # Carga los datos de la sesión
+    session = cargar_sesion(año, ronda, 'FP1')  # Carga los datos de la sesión
 
     # Creamos un diccionario para almacenar el mejor tiempo por equipo
     mejores_tiempos = {}
@@ -78,3 +79,4 @@ try:
 
 except Exception as e:
     print(f"Error al cargar datos de test: {str(e)}")
+    sys.exit(1)
@@ -0,0 +1,137 @@
+# ---------- Importamos las librerías necesarias ----------
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+from calendario import TEMPORADA, rondas_recientes, sesiones_libres
+from datos_f1 import activar_cache, cargar_sesion
+from prediccion import COLUMNAS_PERFIL
+
+
+# ---------- Configuración inicial ----------
+
+# Activamos la caché compartida de la API para usar sus datos
+activar_cache()
+
+# Tiempos por sector y trampa de velocidad situada dentro de cada sector
+SECTORES = ['Sector1Time', 'Sector2Time', 'Sector3Time']
+TRAMPAS_SECTOR = ['SpeedI1', 'SpeedI2', 'SpeedFL']
+
+
+# ---------- Función que calcula el perfil de los coches de un evento ----------
+
+def calcular_perfil(vueltas):
+    """Calcula los índices de rendimiento en curva lenta, media y rápida por equipo.
+
+    Cada sector se clasifica como lento, medio o rápido según la velocidad
+    mediana de su trampa de velocidad. El índice de cada equipo en un sector
+    es el mejor tiempo del sector entre todos los equipos dividido por el
+    mejor tiempo del equipo (1 = el más rápido). El índice de alta velocidad
+    se combina además con la velocidad punta en el speed trap.
+    """
+
+    vueltas = vueltas.dropna(subset=['Team'])
+    equipos = vueltas['Team']
+
+    # Mejor tiempo de cada equipo en cada sector
+    tiempos = pd.DataFrame({s: vueltas[s].dt.total_seconds() for s in SECTORES})
+    mejores = tiempos.groupby(equipos).min()
+    rendimiento = mejores.min() / mejores
+
+    # Ordenamos los sectores de más lento a más rápido por su trampa de velocidad
+    velocidades = vueltas[TRAMPAS_SECTOR].median().to_numpy()
+    lento, medio, rapido = np.argsort(velocidades)
+
+    # Velocidad punta de cada equipo relativa a la mejor
+    punta = vueltas.groupby(equipos)['SpeedST'].max()
+    punta = (punta / punta.max()).fillna(rendimiento.iloc[:, rapido])
+
+    perfil = pd.DataFrame({
+        'indice_baja': rendimiento.iloc[:, lento],
+        'indice_media': rendimiento.iloc[:, medio],
+        'indice_alta': (rendimiento.iloc[:, rapido] + punta) / 2,
+    })
+    perfil.index.name = 'Equipo'
+
+    return perfil.reset_index()
+
+
+# ---------- Función para obtener el perfil de un evento (con caché) ----------
+
+def obtener_perfil_evento(año, ronda, cache_dir):
+    """Devuelve (perfil, completo) de un evento, leyéndolo de la caché si ya existe.
+
+    Sólo se guarda en caché si se han cargado todas las sesiones de libres
+    del evento, para no servir para siempre un perfil parcial.
+    """
+
+    filename = os.path.join(cache_dir, f'perfil_{año}_{ronda}.csv')
+    if os.path.exists(filename):
+        return pd.read_csv(filename), True
+
+    # Juntamos las vueltas de todos los entrenamientos libres del evento
+    vueltas = []
+    for sesion in sesiones_libres(ronda):
+        try:
+            session = cargar_sesion(año, ronda, sesion, telemetry=False,
+                                    weather=False, messages=False)
+            vueltas.append(session.laps)
+        except Exception as e:
+            print(f" Sin datos de {sesion} en la ronda {ronda}: {str(e)}")
+
+    if not vueltas:
+        return None, False
+
+    perfil = calcular_perfil(pd.concat(vueltas, ignore_index=True))
+    completo = len(vueltas) == len(sesiones_libres(ronda))
+    if completo:
+        perfil.to_csv(filename, index=False)
+
+    return perfil, completo
+
+
+# ---------- Función principal ----------
+
+def main(num_eventos=3):
+    print("\n🔍 Calculando el perfil de los coches en libres...")
+
+    año = TEMPORADA
+
+    # Últimos eventos ya disputados según el calendario
+    rondas = rondas_recientes(num_eventos)
+
+    # Configuramos la ruta de salida y la caché por evento
+    output_dir = os.path.expanduser('/home/usuario/CurvaIV/datos/resultados')
+    cache_dir = os.path.join(output_dir, 'perfiles')
+    os.makedirs(cache_dir, exist_ok=True)
+    filename = os.path.join(output_dir, 'perfil_coches.csv')
+
+    perfiles = [obtener_perfil_evento(año, ronda, cache_dir) for ronda in rondas]
+    completo = all(c for _, c in perfiles)
+    if not completo:
+        print(" Aviso: faltan sesiones de libres; esos eventos no se guardan en caché")
+    perfiles = [p for p, _ in perfiles if p is not None]
+
+    if not perfiles:
+        print(" No se encontraron datos de entrenamientos libres")
+        sys.exit(1)
+
+    # Promediamos los últimos eventos para suavizar el perfil
+    perfil = (pd.concat(perfiles).groupby('Equipo')[COLUMNAS_PERFIL]
+              .mean().round(4).reset_index())
+
+    if os.path.exists(filename):
+        os.remove(filename)
+    perfil.to_csv(filename, index=False)
+
+    print("\n Perfil de coches exportado exitosamente")
+    print(f" Archivo: {filename}")
+
+    # Avisamos con un código de error si el perfil está incompleto
+    if not completo:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
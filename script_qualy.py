@@ -1,51 +1,24 @@
 # ---------- Importamos las librerías necesarias ----------
-import fastf1
 import csv
 import os
-from datetime import datetime
+import sys
+
+from calendario import sesion_qualy
+from datos_f1 import activar_cache, cargar_sesion
 
 
 # ---------- Configuración inicial ----------
 
-# Activamos la caché de la API para usar sus datos
-fastf1.Cache.enable_cache('cache_f1')
+# Activamos la caché compartida de la API para usar sus datos
+activar_cache()
 
 
 # ---------- Función para obtener la última qualy ----------
 
 def obtener_ultima_qualy():
-    """Obtiene la última sesión de clasificación disponible antes de hoy"""
-
-    año_actual = datetime.now().year
-
-    try:
-        # Obtenemos el calendario de eventos del año actual
-        calendario = fastf1.get_event_schedule(año_actual)
+    """Obtiene la última sesión de clasificación disputada según el calendario"""
 
-        # Filtramos solo los eventos cuya fecha ya pasó
-        eventos_pasados = calendario[calendario['EventDate'] < datetime.now()]
-
-        # Si hay eventos pasados, tomamos el último
-        if not eventos_pasados.empty:
-            ultimo_evento = eventos_pasados.iloc[-1]
-            return año_actual, ultimo_evento.RoundNumber, 'Q'
-
-    except Exception as e:
-        print(f" Error al obtener el calendario {año_actual}: {str(e)}")
-        pass
-
-    # ---------- Fallback si no se encuentra una qualy previa ----------
-
-    try:
-        # Si todo falla, cargamos el calendario de nuevo
-        calendario = fastf1.get_event_schedule(año_actual)
-
-        # Devolvemos la última ronda del calendario como emergencia
-        return año_actual, calendario.iloc[-1].RoundNumber, 'Q'
-
-    except Exception as e:
-        print(f" Error al cargar eventos de fallback: {str(e)}")
-        return año_actual, 1, 'Q'
+    return sesion_qualy()
 
 
 # ---------- Función principal ----------
@@ -57,8 +30,7 @@ def main():
     año, ronda, sesion = obtener_ultima_qualy()
 
     try:
-        session = fastf1.get_session(año, ronda, sesion)
-        session.load()
+        session = cargar_sesion(año, ronda, sesion)
 
         # Configuramos la ruta de salida
         output_dir = os.path.expanduser(
@@ -87,7 +59,7 @@ def main():
 
     except Exception as e:
         print(f"\n Error al procesar la sesión: {str(e)}\n")
-        exit()
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -1,22 +1,22 @@
 # ---------- Importamos las librerías necesarias ----------
 import os
+import sys
 import fastf1
+import numpy as np
 import pandas as pd
-from datetime import datetime
-from sklearn.preprocessing import LabelEncoder
+
+from calendario import TEMPORADA, carreras_disputadas
+from datos_f1 import activar_cache, cargar_sesion
+from clasificacion import PUNTOS_PODIO, calcular_clasificacion
 
 # ---------- Configuración inicial ----------
 
 # Usa solo consultas de fastf1
 fastf1.ergast.Ergast.disabled = True
-year = 2025
-
-# Carpeta para cachear datos descargados
-cache_path = os.path.expanduser("~/cache_f1")
-os.makedirs(cache_path, exist_ok=True)
+year = TEMPORADA
 
-# Activar cache en fastf1 para mejorar rendimiento
-fastf1.Cache.enable_cache(cache_path)
+# Activar la caché compartida de fastf1 para mejorar rendimiento
+activar_cache()
 
 # Carpeta donde se guardarán los CSV para Grafana
 grafana_dir = "/var/lib/grafana/csv"
@@ -61,65 +61,20 @@ def verificar_directorio():
 # ---------- Función para obtener todas las rondas de carreras ya disputadas hasta hoy ----------
 
 def obtener_carreras():
-    try:
-        # Obtiene calendario de la temporada
-        calendario = fastf1.get_event_schedule(year)
-        hoy = datetime.now().date()
-        return calendario[calendario['EventDate'].dt.date <= hoy]['RoundNumber'].tolist()
-    except Exception as e:
-        print(f"Error obteniendo calendario: {e}")
-        return []
+    # Rondas disputadas según el calendario compartido con el pipeline
+    return [ronda for ronda, _ in carreras_disputadas()]
 
 
 # ---------- Función que calcula rankings de podios (pilotos o equipos) ----------
 
-def calcular_rankings(podios, es_piloto=True):
-
-    # Convierte la lista de podios a DataFrame con una columna 'Nombre'
-    df = pd.DataFrame(podios, columns=['Nombre'])
-
-    # Asigna la posición en el podio basado en el índice del DataFrame
-    df['PosicionPodio'] = (df.index % 3) + 1
-
-    # Cuenta total de podios por nombre
-    total_podios = df['Nombre'].value_counts().reset_index()
-    total_podios.columns = ['Nombre', 'TotalPodios']
-
-    # Cuenta de primeros lugares
-    primeros = df[df['PosicionPodio'] ==
-                  1]['Nombre'].value_counts().reset_index()
-    primeros.columns = ['Nombre', 'PrimerosLugares']
-
-    # Cuenta de segundos lugares
-    segundos = df[df['PosicionPodio'] ==
-                  2]['Nombre'].value_counts().reset_index()
-    segundos.columns = ['Nombre', 'SegundosLugares']
-
-    # Combina todos los conteos en un solo DataFrame
-    ranking = total_podios.merge(primeros, on='Nombre', how='left')
-    ranking = ranking.merge(segundos, on='Nombre', how='left')
-
-    # Rellena valores NaN con 0 (por si alguien no tiene segundos o primeros lugares)
-    ranking.fillna(0, inplace=True)
-
-    # Convierte columnas a enteros
-    ranking['TotalPodios'] = ranking['TotalPodios'].astype(int)
-    ranking['PrimerosLugares'] = ranking['PrimerosLugares'].astype(int)
-    ranking['SegundosLugares'] = ranking['SegundosLugares'].astype(int)
+def calcular_rankings(nombres, posiciones, es_piloto=True):
 
     # Selecciona la prioridad correspondiente para desempatar
     prioridad = PRIORIDAD_PILOTOS if es_piloto else PRIORIDAD_EQUIPOS
 
-    # Mapea la prioridad en la columna 'Prioridad'
-    ranking['Prioridad'] = ranking['Nombre'].map(prioridad).fillna(99)
-
-    # Ordena el ranking
-    ranking = ranking.sort_values(
-        by=['TotalPodios', 'PrimerosLugares', 'SegundosLugares', 'Prioridad'],
-        ascending=[False, False, False, True]
-    )
-
-    return ranking
+    # Ordena por podios y desempata por primeros y segundos lugares
+    return calcular_clasificacion(nombres, posiciones, sistema_puntos=PUNTOS_PODIO,
+                                  top_n=3, criterio='top', prioridad=prioridad)
 
 
 # ---------- Función principal ----------
@@ -127,47 +82,47 @@ def calcular_rankings(podios, es_piloto=True):
 def main():
     # Verifica que el directorio de salida esté accesible y se pueda escribir
     if not verificar_directorio():
-        return
+        return False
 
     # Obtiene lista de rondas disputadas hasta hoy
     rondas = obtener_carreras()
     if not rondas:
-        return
+        return True
 
-    podios_pilotos = []  # Lista para guardar nombres de pilotos que subieron al podio
-    podios_equipos = []   # Lista para guardar nombres de equipos en podio
+    resultados = []  # Lista con los resultados completos de cada ronda
 
     # Recorre cada ronda para extraer los resultados
     for ronda in rondas:
         try:
-            carrera = fastf1.get_session(year, ronda, 'R')
-            carrera.load(telemetry=False, weather=False)
-            resultados = carrera.results.sort_values(
-                'Position').head(3)  # Top 3 pilotos
-
-            # Agrega pilotos y equipos a sus listas de podios
-            for _, fila in resultados.iterrows():
-                podios_pilotos.append(fila['FullName'])
-                podios_equipos.append(fila['TeamName'])
+            carrera = cargar_sesion(year, ronda, 'R', telemetry=False, weather=False)
+            resultados.append(
+                carrera.results[['FullName', 'TeamName', 'Position']])
         except Exception as e:
             print(f"Error en ronda {ronda}: {e}")
 
+    if not resultados:
+        return False
+    completo = len(resultados) == len(rondas)
+    resultados = pd.concat(resultados, ignore_index=True)
+
     # Calcula los rankings ordenados de pilotos y equipos con base en podios
-    ranking_pilotos = calcular_rankings(podios_pilotos, es_piloto=True)
-    ranking_equipos = calcular_rankings(podios_equipos, es_piloto=False)
+    ranking_pilotos = calcular_rankings(
+        resultados['FullName'], resultados['Position'], es_piloto=True)
+    ranking_equipos = calcular_rankings(
+        resultados['TeamName'], resultados['Position'], es_piloto=False)
 
     # Total de carreras disputadas, usado para calcular porcentaje de podios
     rondas_totales = len(rondas)
 
     # Función para guardar CSV con los top 3 y sus porcentajes
     def guardar_csv(df, tipo):
-        df['Porcentaje'] = (df['TotalPodios'] /
-                            (rondas_totales * 3) * 100).round().astype(int)
+        porcentaje = (df['TotalPodios'] /
+                      (rondas_totales * 3) * 100).round().astype(int).to_numpy()
 
-        # Ajusta porcentajes para evitar empates
-        for i in range(1, len(df)):
-            if df.iloc[i]['Porcentaje'] == df.iloc[i-1]['Porcentaje']:
-                df.at[i, 'Porcentaje'] = df.iloc[i]['Porcentaje'] - 1
+        # Ajusta porcentajes para evitar empates (cada uno estrictamente menor que el anterior)
+        indice = np.arange(len(porcentaje))
+        porcentaje = np.minimum.accumulate(porcentaje + indice) - indice
+        df['Porcentaje'] = np.clip(porcentaje, 0, None)
 
         # Guarda solo columnas Nombre y Porcentaje del top 3 en CSV en la carpeta Grafana
         df[['Nombre', 'Porcentaje']].head(3).to_csv(
@@ -183,8 +138,13 @@ def main():
     guardar_csv(ranking_pilotos, 'pilotos')
     guardar_csv(ranking_equipos, 'escuderias')
 
+    # Devuelve False si alguna ronda no se pudo cargar
+    return completo
+
 
 if __name__ == "__main__":
     print("Calculando podios F1 2025...")
-    main()
+    completo = main()
     print("Proceso completado")
+    if not completo:
+        sys.exit(1)